@@ -19,9 +19,13 @@ For Python Beginners:
 """
 
 # Import required Python libraries
+import io
+import os
 import random
-import xml.etree.ElementTree as ET
-from typing import List, Tuple, Dict, Optional, Union
+import stat
+import tempfile
+from collections import defaultdict
+from typing import List, Dict, Optional, TextIO, Union
 from pathlib import Path
 from datetime import datetime
 
@@ -36,6 +40,50 @@ CELL_SIZE = 10        # Size of each DNA "piece" in the block
 CELLS_PER_SIDE = 8    # Makes our 8x8 grid (increased from 4)
 CELLS_FROM_EACH_PARENT = 32  # Each parent gives exactly half their DNA (32 of 64 cells)
 
+# Color pairs represent different versions of traits
+# Each pair could represent things like:
+# - Brown eyes (black) vs Blue eyes (white)
+# - Curly hair (red) vs Straight hair (green)
+# These are the default colors - change this list, or a diagram's 'colors', to use your own
+TRAIT_COLORS = [
+    ("black", "white"),
+    ("#ff0000", "#008000"),  # red, green
+    ("#0000ff", "#ffa500"),  # blue, orange
+    ("#ffff00", "#800080")   # yellow, purple
+]
+
+# These never change, so we turn them into SVG text once when the program starts
+# instead of again for every cell of every block
+_CELLS_PER_BLOCK = CELLS_PER_SIDE * CELLS_PER_SIDE
+_BLOCK_SIZE_STR = str(BLOCK_SIZE)
+_COORD_STR = [str(i * CELL_SIZE) for i in range(CELLS_PER_SIDE + 1)]  # '0', '10', ... '80'
+_CELL_SQUARES = [  # The outline of the square at each cell number (0-63), as SVG path text
+    f'M{_COORD_STR[col]} {_COORD_STR[row]}h{CELL_SIZE}v{CELL_SIZE}h-{CELL_SIZE}z'
+    for row in range(CELLS_PER_SIDE)
+    for col in range(CELLS_PER_SIDE)
+]
+
+# The grid lines inside a block, using short SVG path commands
+# M = Move to, v = draw down (vertical), h = draw right (horizontal)
+_GRID_LINES_D = (''.join(f'M{c},0v{_BLOCK_SIZE_STR}' for c in _COORD_STR[1:CELLS_PER_SIDE])
+                 + ''.join(f'M0,{c}h{_BLOCK_SIZE_STR}' for c in _COORD_STR[1:CELLS_PER_SIDE]))
+
+# Every block gets the same grid lines and border, so they are defined once (with an id)
+# and each block just points at them with a short SVG 'use' element
+# (SVG lines are 1 unit wide unless told otherwise, so the grid lines don't need 'stroke-width')
+# The border only shows its outer half (0.5 wide, just outside the block), because the
+# colored cells have always covered the inner half of the block's outline
+_GRID_OVERLAY_SVG = (f'<g id="blockgrid">'
+                     f'<rect width="{_BLOCK_SIZE_STR}" height="{_BLOCK_SIZE_STR}" fill="url(#grid8x8)"/>'
+                     f'<rect x="-.25" y="-.25" width="{BLOCK_SIZE + 0.5}" height="{BLOCK_SIZE + 0.5}" '
+                     'fill="none" stroke="black" stroke-width=".5"/>'
+                     '</g>')
+_GRID_OVERLAY_USE = '<use href="#blockgrid"/>'
+
+# _BYTE_MASKS turns 8 coin flips (the 8 bits of one byte) into 8 bytes:
+# 0xff where the coin chose parent1 and 0x00 where it chose parent2
+_BYTE_MASKS = [bytes(0xff if (flips >> bit) & 1 else 0x00 for bit in range(8)) for flips in range(256)]
+
 class Block:
     """
     A Block represents one person in our family tree.
@@ -49,9 +97,18 @@ class Block:
     - This is a 'class' - think of it as a template for creating person blocks
     - Each block we create is an 'instance' of this class
     - The class keeps track of which cells have which colors (representing genetic traits)
+    - Each cell only stores a small number pointing into a palette (a flat list of colors)
+    - PALETTE is the default palette, made from TRAIT_COLORS
     """
     
-    def __init__(self, cells: Optional[Dict[Tuple[int, int], str]] = None):
+    # A Block only ever stores 'cells'; listing it in __slots__ lets Python skip the
+    # per-block dictionary it would normally keep for attributes, saving memory
+    __slots__ = ('cells',)
+    
+    # Every default trait color, in order: PALETTE[0] is "black", PALETTE[1] is "white", and so on
+    PALETTE: List[str] = [color for pair in TRAIT_COLORS for color in pair]
+    
+    def __init__(self, cells: Optional[bytes] = None):
         """
         Create a new person block.
         
@@ -62,11 +119,12 @@ class Block:
         Python Concept:
         - This is called a 'constructor' - it runs when we create a new Block
         - The 'Optional' means cells can be None (empty) or have values
-        - Dict[Tuple[int, int], str] means we store colors (str) at grid positions (row, col)
+        - 'bytes' is a compact list of small numbers (0-255): one number per cell, read row by row
+        - Each number is a position in PALETTE, so cells[0] == 1 means the top-left cell is white
         """
-        self.cells: Dict[Tuple[int, int], str] = cells if cells else {}
+        self.cells: bytes = cells if cells else b''
     
-    def set_solid_color(self, color: str) -> None:
+    def set_solid_color(self, color: str, palette: Optional[List[str]] = None) -> None:
         """
         Make all cells the same color (used for first generation).
         
@@ -76,12 +134,27 @@ class Block:
         
         Python Concept:
         - This is a 'method' - a function that belongs to our Block class
-        - We use a 'dictionary comprehension' to fill all cells with one color
+        - We look up the color's number in the palette (PALETTE unless we are given another one)
+          and let set_solid_index do the rest
         - The -> None means this function doesn't return anything
+        
+        Raises:
+            ValueError: If the color is not in the palette
+        """
+        if palette is None:
+            palette = self.PALETTE
+        if color not in palette:
+            raise ValueError(f"Unknown color {color!r} - it is not in the palette")
+        self.set_solid_index(palette.index(color))
+    
+    def set_solid_index(self, index: int) -> None:
+        """
+        Make all cells the color stored at position 'index' in the palette.
+        
+        Python Concept:
+        - Each cell stores a palette position, so we repeat that one number for all 64 cells
         """
-        self.cells = {(row, col): color 
-                     for row in range(CELLS_PER_SIDE) 
-                     for col in range(CELLS_PER_SIDE)}
+        self.cells = bytes([index]) * _CELLS_PER_BLOCK
     
     def inherit_from_parents(self, parent1: 'Block', parent2: 'Block') -> None:
         """
@@ -94,19 +167,50 @@ class Block:
         - This simulates how each piece of genetic information comes from one parent or the other
         
         Python Concept:
-        - We iterate through all 64 positions in order
-        - random.choice([True, False]) simulates a coin flip
-        - We build the child's genetic makeup one position at a time
+        - random.getrandbits(64) flips all 64 coins at once: each bit (0 or 1) is one coin
+        - _BYTE_MASKS turns those bits into a 'mask' with 0xff for parent1 and 0x00 for parent2
+        - Python can treat all 64 cells as one big number, so '^' (xor) and '&' (and)
+          combine the parents' cells with the mask in one step instead of one cell at a time
+        
+        Raises:
+            ValueError: If either parent does not have exactly 64 cells
         """
-        # Create the child's genetic makeup by flipping a coin for each position
-        self.cells = {}
-        for row in range(CELLS_PER_SIDE):
-            for col in range(CELLS_PER_SIDE):
-                pos = (row, col)
-                # Flip a coin for each position
-                take_from_parent1 = random.choice([True, False])
-                # Take the gene from whichever parent won the coin flip
-                self.cells[pos] = parent1.cells[pos] if take_from_parent1 else parent2.cells[pos]
+        # Both parents need genetic information for every cell before they can pass it on
+        for parent in (parent1, parent2):
+            if len(parent.cells) != _CELLS_PER_BLOCK:
+                raise ValueError(f"Parent block has {len(parent.cells)} cells, expected {_CELLS_PER_BLOCK}")
+        
+        # Flip all 64 coins in a single call - one random bit per position
+        # (rounded up to whole bytes, then cut back to exactly one mask byte per cell)
+        coin_flips = random.getrandbits(_CELLS_PER_BLOCK).to_bytes((_CELLS_PER_BLOCK + 7) // 8, 'little')
+        mask_bytes = b''.join(map(_BYTE_MASKS.__getitem__, coin_flips))[:_CELLS_PER_BLOCK]
+        mask = int.from_bytes(mask_bytes, 'little')
+        
+        # Keep parent1's cells where the mask is 0xff and parent2's cells everywhere else:
+        # (genes1 ^ genes2) is what would change to turn parent2's cells into parent1's,
+        # and the mask keeps only the changes for the cells that come from parent1
+        genes1 = int.from_bytes(parent1.cells, 'little')
+        genes2 = int.from_bytes(parent2.cells, 'little')
+        self.cells = (genes2 ^ ((genes1 ^ genes2) & mask)).to_bytes(_CELLS_PER_BLOCK, 'little')
+
+def _file_mode_for(target: Path) -> int:
+    """Return the permissions a saved file should get: the existing file's, or the usual default."""
+    try:
+        return stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        # os.umask can only be read by setting it, so we put the old value straight back
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def _remove_quietly(path: Optional[str]) -> None:
+    """Delete a leftover temporary file, without hiding the error that made us give up on it."""
+    if path is None:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
 class GeneticInheritanceSVG:
     """
@@ -136,18 +240,11 @@ class GeneticInheritanceSVG:
         
         self.num_generations = num_generations
         
-        # Color pairs represent different versions of traits
-        # Each pair could represent things like:
-        # - Brown eyes (black) vs Blue eyes (white)
-        # - Curly hair (red) vs Straight hair (green)
-        self.colors = [
-            ("black", "white"),
-            ("#ff0000", "#008000"),  # red, green
-            ("#0000ff", "#ffa500"),  # blue, orange
-            ("#ffff00", "#800080")   # yellow, purple
-        ]
+        # Color pairs represent different versions of traits (see TRAIT_COLORS above)
+        # Change this list before saving to draw this diagram with your own colors
+        self.colors = list(TRAIT_COLORS)
 
-    def create_grid_pattern(self) -> ET.Element:
+    def create_grid_pattern(self) -> str:
         """
         Create the grid lines that divide each person's block into 64 cells.
         
@@ -158,40 +255,17 @@ class GeneticInheritanceSVG:
         
         Python Concept:
         - We use SVG 'pattern' elements to create reusable grid lines
-        - The -> ET.Element tells Python this function returns an SVG element
-        - We use f-strings (f'...') to insert numbers into our SVG paths
+        - SVG is just text, so we write the pattern as a string
+        - The -> str tells Python this function returns that piece of SVG text
+        - The grid lines never change, so their path (_GRID_LINES_D) is worked out once at the top of the file
         """
-        pattern = ET.Element('pattern', {
-            'id': 'grid8x8',
-            'width': str(BLOCK_SIZE),
-            'height': str(BLOCK_SIZE),
-            'patternUnits': 'userSpaceOnUse'
-        })
-        
-        # Create the grid lines using SVG path commands
-        # M = Move to, L = Line to
-        path = ET.SubElement(pattern, 'path', {
-            'd': f'M {CELL_SIZE},0 L {CELL_SIZE},{BLOCK_SIZE} '  # First vertical line
-                 f'M {CELL_SIZE*2},0 L {CELL_SIZE*2},{BLOCK_SIZE} '  # Second vertical line
-                 f'M {CELL_SIZE*3},0 L {CELL_SIZE*3},{BLOCK_SIZE} '  # Third vertical line
-                 f'M {CELL_SIZE*4},0 L {CELL_SIZE*4},{BLOCK_SIZE} '  # Fourth vertical line
-                 f'M {CELL_SIZE*5},0 L {CELL_SIZE*5},{BLOCK_SIZE} '  # Fifth vertical line
-                 f'M {CELL_SIZE*6},0 L {CELL_SIZE*6},{BLOCK_SIZE} '  # Sixth vertical line
-                 f'M {CELL_SIZE*7},0 L {CELL_SIZE*7},{BLOCK_SIZE} '  # Seventh vertical line
-                 f'M 0,{CELL_SIZE} L {BLOCK_SIZE},{CELL_SIZE} '  # First horizontal line
-                 f'M 0,{CELL_SIZE*2} L {BLOCK_SIZE},{CELL_SIZE*2} '  # Second horizontal line
-                 f'M 0,{CELL_SIZE*3} L {BLOCK_SIZE},{CELL_SIZE*3} '  # Third horizontal line
-                 f'M 0,{CELL_SIZE*4} L {BLOCK_SIZE},{CELL_SIZE*4} '  # Fourth horizontal line
-                 f'M 0,{CELL_SIZE*5} L {BLOCK_SIZE},{CELL_SIZE*5} '  # Fifth horizontal line
-                 f'M 0,{CELL_SIZE*6} L {BLOCK_SIZE},{CELL_SIZE*6} '  # Sixth horizontal line
-                 f'M 0,{CELL_SIZE*7} L {BLOCK_SIZE},{CELL_SIZE*7}',  # Seventh horizontal line
-            'fill': 'none',
-            'stroke': 'black',
-            'stroke-width': '1'
-        })
-        return pattern
+        return (f'<pattern id="grid8x8" width="{_BLOCK_SIZE_STR}" height="{_BLOCK_SIZE_STR}" '
+                'patternUnits="userSpaceOnUse">'
+                f'<path d="{_GRID_LINES_D}" fill="none" stroke="black"/>'
+                '</pattern>')
 
-    def create_block_svg(self, x: int, y: int, block: Block) -> ET.Element:
+    def create_block_svg(self, x: int, y: int, block: Block,
+                         palette: Optional[List[str]] = None) -> str:
         """
         Create a visual representation of one person's genetic makeup.
         
@@ -202,56 +276,39 @@ class GeneticInheritanceSVG:
         
         Python Concept:
         - We create an SVG group ('g') to hold all parts of the block
-        - We use loops to create all the cells and grid lines
+        - Cells of the same color are drawn together as one SVG 'path' (a list of small squares)
+        - We use a loop to collect all the cells
+        - The grid lines come from the 'grid8x8' pattern, so we only need one rectangle to draw them
+        - That rectangle is the same for everyone, so we reuse it with 'use' instead of copying it
         - The x,y coordinates position this person in the family tree
+        - 'palette' turns each cell's number back into a color (Block.PALETTE if not given)
+        - We collect the pieces of SVG text in a list and join them together at the end
         """
-        # Create a group to hold all parts of this person's block
-        group = ET.Element('g', {'transform': f'translate({x},{y})'})
-        
-        # Create the white background rectangle
-        ET.SubElement(group, 'rect', {
-            'width': str(BLOCK_SIZE),
-            'height': str(BLOCK_SIZE),
-            'stroke': 'black',
-            'stroke-width': '1',
-            'fill': 'white'
-        })
-        
-        # Draw each colored cell representing genetic traits
-        for (row, col), color in block.cells.items():
-            ET.SubElement(group, 'rect', {
-                'x': str(col * CELL_SIZE),
-                'y': str(row * CELL_SIZE),
-                'width': str(CELL_SIZE),
-                'height': str(CELL_SIZE),
-                'fill': color
-            })
-        
-        # Add the grid lines to separate cells
-        for i in range(1, CELLS_PER_SIDE):
-            # Create vertical lines
-            ET.SubElement(group, 'line', {
-                'x1': str(i * CELL_SIZE),
-                'y1': '0',
-                'x2': str(i * CELL_SIZE),
-                'y2': str(BLOCK_SIZE),
-                'stroke': 'black',
-                'stroke-width': '1'
-            })
-            # Create horizontal lines
-            ET.SubElement(group, 'line', {
-                'x1': '0',
-                'y1': str(i * CELL_SIZE),
-                'x2': str(BLOCK_SIZE),
-                'y2': str(i * CELL_SIZE),
-                'stroke': 'black',
-                'stroke-width': '1'
-            })
-        
-        return group
+        if palette is None:
+            palette = Block.PALETTE
+        
+        # Start a group to hold all parts of this person's block
+        parts = [f'<g transform="translate({x},{y})">']
+        
+        # Collect the outline of every cell, grouped by color
+        # Each square is drawn as: M = Move to its corner, h/v = draw its sides, z = close it
+        # (a defaultdict only makes a new list the first time it sees each color)
+        color_to_d: Dict[int, List[str]] = defaultdict(list)
+        for cell, color in enumerate(block.cells):
+            color_to_d[color].append(_CELL_SQUARES[cell])
+        
+        # Draw all cells of each color (genetic trait) with a single path
+        for color, squares in color_to_d.items():
+            parts.append(f'<path d="{"".join(squares)}" fill="{palette[color]}"/>')
+        
+        # Lay the grid pattern and the black border over the colored cells
+        parts.append(_GRID_OVERLAY_USE)
+        
+        parts.append('</g>')
+        return ''.join(parts)
 
-    def create_connection(self, svg: ET.Element, parent1_x: int, parent2_x: int, 
-                         parent_y: int, child_x: int, child_y: int) -> None:
+    def create_connection(self, parent1_x: int, parent2_x: int, 
+                         parent_y: int, child_x: int, child_y: int) -> str:
         """
         Draw lines connecting parents to their child.
         
@@ -261,29 +318,26 @@ class GeneticInheritanceSVG:
         - The vertical line shows their child inheriting from both parents
         
         Python Concept:
-        - We use SVG paths to draw the connecting lines
-        - The lines are created using move (M) and line (L) commands
+        - We use SVG path commands to describe the connecting lines
+        - The lines are created using move (M), horizontal (h) and vertical (v) commands
         - We calculate the center point between parents for the vertical line
+        - We only return the path commands, so all connections can share one SVG 'path'
         """
+        # Both lines start level with the middle of the parents' blocks
+        line_y = parent_y + BLOCK_SIZE // 2
+        
         # Draw horizontal line connecting the parents
-        ET.SubElement(svg, 'path', {
-            'd': f'M {parent1_x + BLOCK_SIZE},{parent_y + BLOCK_SIZE//2} '
-                 f'L {parent2_x},{parent_y + BLOCK_SIZE//2}',
-            'stroke': 'black',
-            'stroke-width': '1'
-        })
+        horizontal = f'M{parent1_x + BLOCK_SIZE},{line_y}h{parent2_x - parent1_x - BLOCK_SIZE}'
         
         # Draw vertical line down to the child
         center_x = (parent1_x + parent2_x + BLOCK_SIZE) // 2
-        ET.SubElement(svg, 'path', {
-            'd': f'M {center_x},{parent_y + BLOCK_SIZE//2} L {center_x},{child_y}',
-            'stroke': 'black',
-            'stroke-width': '1'
-        })
+        vertical = f'M{center_x},{line_y}v{child_y - line_y}'
+        
+        return horizontal + vertical
 
-    def generate_svg(self) -> str:
+    def write_svg(self, stream: TextIO) -> None:
         """
-        Create the complete family tree visualization.
+        Create the complete family tree visualization and write it to a text stream.
         
         Genetic Concept:
         - This builds a full family tree showing inheritance patterns
@@ -294,28 +348,35 @@ class GeneticInheritanceSVG:
         - This is our main drawing function that puts everything together
         - We use nested loops to create multiple generations
         - We keep track of positions to properly space and connect everyone
-        
-        Returns:
-            A string containing the complete SVG image code
+        - Each piece of SVG text is written to 'stream' (an open file, for example) as soon as
+          it is ready, so the whole picture never has to be held in memory as one big string
         """
         try:
             # Create the main SVG canvas
-            svg = ET.Element('svg', {
-                'xmlns': 'http://www.w3.org/2000/svg',
-                'viewBox': f'-200 -50 1800 {300 * self.num_generations}'  # Wider and taller viewBox with more margins all around
-            })
+            # (a wider and taller viewBox with more margins all around)
+            stream.write('<svg xmlns="http://www.w3.org/2000/svg" '
+                         f'viewBox="-200 -50 1800 {300 * self.num_generations}">')
             
-            # Add the grid pattern we'll use for all blocks
-            defs = ET.SubElement(svg, 'defs')
-            defs.append(self.create_grid_pattern())
+            # Add the grid pattern and the grid-and-border rectangle we'll use for all blocks
+            stream.write(f'<defs>{self.create_grid_pattern()}{_GRID_OVERLAY_SVG}</defs>')
             
-            # Keep track of all blocks so we can connect them properly
-            generation_blocks = []
+            # Collect the path commands for every parent-child connection
+            connections_d: List[str] = []
+            
+            # Keep track of the previous generation's blocks and their x-positions
+            # so we can connect them to their children (prev_xs[i] belongs to prev_blocks[i])
+            prev_xs: List[int] = []
+            prev_blocks: List[Block] = []
             
             # Create the first generation (the oldest generation)
-            first_gen = []
             num_pairs = 2 ** (self.num_generations - 2)  # Calculate how many pairs we need
             
+            # Put all our colors in one flat list, so first-generation person i gets palette[i]
+            # and every cell can store its color as a position in this list
+            palette = [color for pair in self.colors for color in pair]
+            if len(palette) < num_pairs * 2:
+                raise ValueError(f"{self.num_generations} generations need at least {num_pairs} color pairs")
+            
             # Center the blocks horizontally with more space
             total_width = 1400  # Increased total width
             start_x = (total_width - (num_pairs * 2 * (BLOCK_SIZE + BLOCK_SPACING))) // 2
@@ -324,20 +385,19 @@ class GeneticInheritanceSVG:
             for i in range(num_pairs * 2):
                 x = start_x + i * (BLOCK_SIZE + BLOCK_SPACING)
                 y = 50  # First generation y-position
-                color = self.colors[i // 2][i % 2]  # Pick colors from our pairs
-                
                 block = Block()
-                block.set_solid_color(color)
+                block.set_solid_index(i)  # Pick colors from our pairs, one after another (palette[i])
                 
-                svg.append(self.create_block_svg(x, y, block))
-                first_gen.append((x, y, block))
-            
-            generation_blocks.append(first_gen)
+                stream.write(self.create_block_svg(x, y, block, palette))
+                prev_xs.append(x)
+                prev_blocks.append(block)
             
             # Create each subsequent generation
             for gen in range(1, self.num_generations):
-                current_gen = []
+                current_xs: List[int] = []
+                current_blocks: List[Block] = []
                 y = 50 + gen * VERTICAL_SPACING  # Move down for each generation
+                parent_y = y - VERTICAL_SPACING  # All parents are one generation up
                 
                 # Each generation has half as many people as the previous one
                 num_blocks = 2 ** (self.num_generations - gen - 1)
@@ -345,30 +405,52 @@ class GeneticInheritanceSVG:
                 # Create children for each pair of parents
                 for i in range(num_blocks):
                     parent_idx = i * 2
-                    parent1_x, parent1_y, parent1_block = generation_blocks[gen-1][parent_idx]
-                    parent2_x, parent2_y, parent2_block = generation_blocks[gen-1][parent_idx + 1]
+                    parent1_x, parent2_x = prev_xs[parent_idx], prev_xs[parent_idx + 1]
                     
                     # Position child block between its parents
                     child_x = (parent1_x + parent2_x + BLOCK_SIZE) // 2 - BLOCK_SIZE // 2
                     
                     # Create child block and inherit traits from parents
                     child_block = Block()
-                    child_block.inherit_from_parents(parent1_block, parent2_block)
+                    child_block.inherit_from_parents(prev_blocks[parent_idx], prev_blocks[parent_idx + 1])
                     
                     # Add child's block to the visualization
-                    svg.append(self.create_block_svg(child_x, y, child_block))
-                    current_gen.append((child_x, y, child_block))
+                    stream.write(self.create_block_svg(child_x, y, child_block, palette))
+                    current_xs.append(child_x)
+                    current_blocks.append(child_block)
                     
                     # Draw lines connecting child to parents
-                    self.create_connection(svg, parent1_x, parent2_x, parent1_y, child_x, y)
+                    connections_d.append(self.create_connection(parent1_x, parent2_x, parent_y, child_x, y))
                 
-                generation_blocks.append(current_gen)
+                # This generation becomes the parents of the next one
+                prev_xs, prev_blocks = current_xs, current_blocks
+            
+            # Draw all the connecting lines at once, on top of the blocks
+            stream.write(f'<path d="{"".join(connections_d)}" stroke="black" fill="none"/>')
             
-            return ET.tostring(svg, encoding='unicode')
+            stream.write('</svg>')
             
+        except OSError:
+            # Problems writing to the stream are not SVG problems - let the caller handle them
+            raise
         except Exception as e:
             raise ValueError(f"Error generating SVG: {e}")
 
+    def generate_svg(self) -> str:
+        """
+        Create the complete family tree visualization as a string.
+        
+        Python Concept:
+        - io.StringIO is a 'pretend file' that keeps everything written to it in memory
+        - We let write_svg write into it, then read the finished text back out
+        
+        Returns:
+            A string containing the complete SVG image code
+        """
+        buffer = io.StringIO()
+        self.write_svg(buffer)
+        return buffer.getvalue()
+
     def save_svg(self, filename: Union[str, Path]) -> None:
         """
         Save the family tree visualization as an SVG file.
@@ -377,15 +459,35 @@ class GeneticInheritanceSVG:
         - This saves our inheritance diagram in SVG format
         - SVG files can be viewed in any web browser
         - The diagram will stay sharp and clear at any size
+        
+        Python Concept:
+        - We pass the open file straight to write_svg, so the SVG is written piece by piece
+        - buffering=65536 lets Python collect 64 KB of text before each actual write to disk
+        - newline='' tells Python to write the text exactly as it is, on every operating system
+        - We write to a temporary file next to the real one and only rename it into place once
+          the whole SVG is finished, so a failure never leaves a half-written diagram behind
         """
+        # Follow shortcuts (symlinks) so we save into the real file they point to
+        target = Path(os.path.realpath(filename))
+        temp_file: Optional[str] = None
         try:
-            # Generate and save SVG
-            svg_content = self.generate_svg()
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(svg_content)
+            # A new, uniquely named temporary file in the same folder as the real one
+            fd, temp_file = tempfile.mkstemp(dir=target.parent, suffix='.tmp')
+            with open(fd, 'w', encoding='utf-8', newline='', buffering=65536) as f:
+                # Start with a line saying which XML version and encoding the file uses
+                f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+                self.write_svg(f)
+            
+            # Give the new file the same permissions an ordinary save would have had
+            os.chmod(temp_file, _file_mode_for(target))
+            os.replace(temp_file, target)
             
         except OSError as e:
-            raise OSError(f"Error saving file: {e}")
+            _remove_quietly(temp_file)
+            raise OSError(f"Error saving file {filename}: {e.strerror or e}")
+        except ValueError:
+            _remove_quietly(temp_file)
+            raise
 
 def main() -> None:
     """